@@ -20,6 +20,7 @@
 #
 
 TOOLDIR=$(dirname $0)
+SETUPCFG="${TOOLDIR}/../.github/linters/setup.cfg"
 
 case "$OSTYPE" in
   *bsd*) MAKECMD=gmake;;
@@ -33,6 +34,9 @@ spell=0
 encoding=0
 message=0
 
+# nxstyle is built just before the first check, see build_nxstyle
+nxstyle_built=0
+
 # CMake
 cmake_warning_once=0
 
@@ -43,6 +47,7 @@ isort_warning_once=0
 
 cvt2utf_warning_once=0
 codespell_config_file_location_was_shown_once=0
+spell_files=()
 
 # links
 COMMIT_URL="https://github.com/apache/nuttx/blob/master/CONTRIBUTING.md"
@@ -68,41 +73,44 @@ usage() {
   exit $@
 }
 
-is_rust_file() {
-  file_ext=${@##*.}
-  file_ext_r=${file_ext/R/r}
-  file_ext_rs=${file_ext_r/S/s}
-
-  if [ "$file_ext_rs" == "rs" ]; then
-    echo 1
-  else
-    echo 0
+# Classify a file by name in a single pass and without forking a subshell.
+# Line ranges (-r) are only understood by nxstyle, so anything but a lone
+# path is handed to it.
+
+get_file_type() {
+  file_type=c
+  if [ $# == 1 ]; then
+    case ${1##*/} in
+      *.py)
+        file_type=python
+        ;;
+      *.[rR][sS])
+        file_type=rust
+        ;;
+      CMakeLists.txt | *.cmake)
+        file_type=cmake
+        ;;
+    esac
   fi
 }
 
-is_python_file() {
-  if [[ ${@##*.} == 'py' ]]; then
-    echo 1
-  else
-    echo 0
-  fi
-}
+# Build nxstyle before anything is checked, so that make's messages come
+# ahead of the report and, in -p mode, nxstyle is built from the tree as it
+# was before the patch got applied.
 
-is_cmake_file() {
-  file_name=$(basename $@)
-  if [ "$file_name" == "CMakeLists.txt" ] || [[ "$file_name" =~ \.cmake$ ]]; then
-    echo 1
-  else
-    echo 0
+build_nxstyle() {
+  if [ $nxstyle_built == 0 ]; then
+    $MAKECMD -C $TOOLDIR -f Makefile.host nxstyle 1>/dev/null
+    nxstyle_built=1
   fi
 }
 
 format_file() {
-  if [ "$(is_python_file $@)" == "1" ]; then
+  get_file_type $@
+  if [ $file_type == python ]; then
     if command -v black >/dev/null; then
       echo "Auto-formatting Python file with black: $@"
-      setupcfg="${TOOLDIR}/../.github/linters/setup.cfg"
-      isort --settings-path "${setupcfg}" "$@"
+      isort --settings-path "${SETUPCFG}" "$@"
       black $@
     else
       echo "$@: error: black not found. Please install with: pip install black"
@@ -127,8 +135,8 @@ check_file() {
     esac
   fi
 
-  if [ "$(is_python_file $@)" == "1" ]; then
-    setupcfg="${TOOLDIR}/../.github/linters/setup.cfg"
+  get_file_type $@
+  if [ $file_type == python ]; then
     if ! command -v black &> /dev/null; then
       if [ $black_warning_once == 0 ]; then
         echo -e "\nblack not found, run following command to install:"
@@ -151,7 +159,7 @@ check_file() {
         flake8_warning_once=1
       fi
       fail=1
-    elif ! flake8 --config "${setupcfg}" "$@" 2>&1; then
+    elif ! flake8 --config "${SETUPCFG}" "$@" 2>&1; then
       if [ $flake8_warning_once == 0 ]; then
         echo -e "\nflake8 check failed !!!"
         flake8_warning_once=1
@@ -165,14 +173,14 @@ check_file() {
         isort_warning_once=1
       fi
       fail=1
-    elif ! isort --diff --check-only --settings-path "${setupcfg}" "$@" 2>&1; then
+    elif ! isort --diff --check-only --settings-path "${SETUPCFG}" "$@" 2>&1; then
       if [ $isort_warning_once == 0 ]; then
-        isort --settings-path "${setupcfg}" "$@"
+        isort --settings-path "${SETUPCFG}" "$@"
         isort_warning_once=1
       fi
       fail=1
     fi
-  elif [ "$(is_rust_file $@)" == "1" ]; then
+  elif [ $file_type == rust ]; then
     if ! command -v rustfmt &> /dev/null; then
       echo -e "\nrustfmt not found, run following command to install:"
       echo "  $ rustup component add rustfmt"
@@ -180,7 +188,7 @@ check_file() {
     elif ! rustfmt --edition 2021 --check $@ 2>&1; then
       fail=1
     fi
-  elif [ "$(is_cmake_file $@)" == "1" ]; then
+  elif [ $file_type == cmake ]; then
     if ! command -v cmake-format &> /dev/null; then
       if [ $cmake_warning_once == 0 ]; then
         echo -e "\ncmake-format not found, run following command to install:"
@@ -192,7 +200,6 @@ check_file() {
       if [ $cmake_warning_once == 0 ]; then
         echo -e "\ncmake-format check failed, run following command to update the style:"
         echo -e "  $ cmake-format <src> -o <dst>\n"
-        cmake-format --check $@ 2>&1
         cmake_warning_once=1
       fi
       fail=1
@@ -202,25 +209,8 @@ check_file() {
   fi
 
   if [ $spell != 0 ]; then
-    if ! command -v codespell &> /dev/null; then
-      if [ $codespell_config_file_location_was_shown_once == 0 ]; then
-        echo -e "\ncodespell not found, run following command to install:"
-        echo "  $ pip install codespell"
-        codespell_config_file_location_was_shown_once=1
-      fi
-      fail=1
-    else
-      if [ $codespell_config_file_location_was_shown_once != 1 ]; then
-        # show the configuration file location just once during (not for each input file)
-        codespell_args="-q 7"
-        codespell_config_file_location_was_shown_once=1
-      else
-        codespell_args=""
-      fi
-      if ! codespell $codespell_args ${@: -1}; then
-        fail=1
-      fi
-    fi
+    # Spell checking is batched, see check_spell
+    spell_files+=("${@: -1}")
   fi
 
   if [ $encoding != 0 ]; then
@@ -245,8 +235,50 @@ check_file() {
   fi
 }
 
+# Run codespell once over all the files collected by check_file rather than
+# starting it for every single file.
+
+check_spell() {
+  if [ ${#spell_files[@]} == 0 ]; then
+    return
+  fi
+
+  if ! command -v codespell &> /dev/null; then
+    if [ $codespell_config_file_location_was_shown_once == 0 ]; then
+      echo -e "\ncodespell not found, run following command to install:"
+      echo "  $ pip install codespell"
+      codespell_config_file_location_was_shown_once=1
+    fi
+    fail=1
+  else
+    if [ $codespell_config_file_location_was_shown_once != 1 ]; then
+      # show the configuration file location just once during (not for each input file)
+      codespell_args="-q 7"
+      codespell_config_file_location_was_shown_once=1
+    else
+      codespell_args=""
+    fi
+    if ! codespell $codespell_args "${spell_files[@]}"; then
+      fail=1
+    fi
+  fi
+
+  spell_files=()
+}
+
 check_ranges() {
   while read; do
+    # Only the file and hunk headers matter here, a glob is much cheaper
+    # than the regular expressions below for all the other diff lines.
+
+    case $REPLY in
+    "+++ "* | *"@@ -"*)
+      ;;
+    *)
+      continue
+      ;;
+    esac
+
     if [[ $REPLY =~ ^(\+\+\+\ (b/)?([^[:blank:]]+).*)$ ]]; then
       if [ "$ranges" != "" ]; then
         if [ $range != 0 ]; then
@@ -268,15 +300,17 @@ check_ranges() {
       check_file $path
     fi
   fi
+
+  check_spell
 }
 
 check_patch() {
   if ! git apply --check $1; then
     fail=1
   else
+    build_nxstyle
     git apply $1
-    diffs=`cat $1`
-    check_ranges <<< "$diffs"
+    check_ranges < $1
     git apply -R $1
   fi
 }
@@ -287,7 +321,7 @@ check_msg() {
   max_line_len=80
   min_num_lines=5
 
-  first=$(head -n1 <<< "$msg")
+  first=${msg%%$'\n'*}
 
   # check for Merge line and remove from parsed string
   if [[ $first == *Merge* ]]; then
@@ -352,12 +386,9 @@ check_commit() {
       check_msg <<< "$msg"
     fi
   fi
-  diffs=`git diff $1`
-  check_ranges <<< "$diffs"
+  check_ranges < <(git diff $1)
 }
 
-$MAKECMD -C $TOOLDIR -f Makefile.host nxstyle 1>/dev/null
-
 if [ -z "$1" ]; then
   usage
   exit 0
@@ -366,6 +397,7 @@ fi
 while [ ! -z "$1" ]; do
   case "$1" in
   - )
+    build_nxstyle
     check_ranges
     ;;
   -c )
@@ -406,8 +438,12 @@ while [ ! -z "$1" ]; do
 done
 
 for arg in $@; do
+  if [ $check != format_file ]; then
+    build_nxstyle
+  fi
   $check $arg
 done
+check_spell
 
 
 if [ $fail == 1 ]; then
@@ -46,12 +46,17 @@
 #endif
 
 #define LINE_SIZE      512
+#define IOBUFFER_SIZE  (64 * 1024)
 #define RANGE_NUMBER   4096
 #define DEFAULT_WIDTH  78
 
 #define FIRST_SECTION  INCLUDED_FILES
 #define LAST_SECTION   PUBLIC_FUNCTION_PROTOTYPES
 
+#define NELEMS(a)      (sizeof(a) / sizeof((a)[0]))
+
+#define KEYWORD(s, t, e) { (s), sizeof(s) - 1, (t), (e) }
+
 #define FATAL(m, l, o) message(FATAL, (m), (l), (o))
 #define FATALFL(m, s)  message(FATAL, (m), -1, -1)
 #define WARN(m, l, o)  message(WARN, (m), (l), (o))
@@ -114,12 +119,30 @@ enum pptype_e
   PPLINE_OTHER
 };
 
+enum keyword_e
+{
+  KEYWORD_DECLARATION = 0, /* Begins a data or function declaration */
+  KEYWORD_STATEMENT,       /* Begins some other statement */
+  KEYWORD_IF,              /* Begins an 'if' statement */
+  KEYWORD_FOR,             /* Begins a 'for' statement */
+  KEYWORD_SWITCH,          /* Begins a 'switch' statement */
+  KEYWORD_CASE             /* Begins a 'case' or 'default' label */
+};
+
 struct file_section_s
 {
   const char *name;   /* File section name */
   uint8_t     ftype;  /* File type where section found */
 };
 
+struct keyword_s
+{
+  const char *name;   /* Keyword and the character that follows it */
+  uint8_t     len;    /* Length of name */
+  uint8_t     type;   /* See enum keyword_e */
+  bool        error;  /* True: Report missing whitespace after keyword */
+};
+
 /********************************************************************************
  * Private data
  ********************************************************************************/
@@ -133,6 +156,7 @@ static int g_rangenumber        = 0;
 static int g_rangestart[RANGE_NUMBER];
 static int g_rangecount[RANGE_NUMBER];
 static char g_file_name[PATH_MAX];
+static char g_iobuffer[IOBUFFER_SIZE];
 static bool g_skipmixedcase;
 
 static const struct file_section_s g_section_info[] =
@@ -187,6 +211,85 @@ static const struct file_section_s g_section_info[] =
   }
 };
 
+/* Keywords that may begin a line of code.  Each line is classified by
+ * looking up its first word here once and then dispatching on the keyword
+ * type.
+ *
+ * REVISIT: The following logic fails for any non-standard types.
+ * REVISIT: Terminator after keyword might not be a space.  Might be
+ * a newline, for example.  struct and unions are often unnamed, for
+ * example.
+ * REVISIT:  This, obviously, will not detect statements that do not
+ * begin with a C keyword (such as assignment statements).
+ */
+
+static const struct keyword_s g_keywords[] =
+{
+  KEYWORD("auto ",     KEYWORD_DECLARATION, false),
+  KEYWORD("bool ",     KEYWORD_DECLARATION, false),
+  KEYWORD("char ",     KEYWORD_DECLARATION, false),
+  KEYWORD("CODE ",     KEYWORD_DECLARATION, false),
+  KEYWORD("const ",    KEYWORD_DECLARATION, false),
+  KEYWORD("double ",   KEYWORD_DECLARATION, false),
+  KEYWORD("struct ",   KEYWORD_DECLARATION, false),
+  KEYWORD("struct\n",  KEYWORD_DECLARATION, false), /* May be unnamed */
+  KEYWORD("enum ",     KEYWORD_DECLARATION, false),
+  KEYWORD("extern ",   KEYWORD_DECLARATION, false),
+  KEYWORD("EXTERN ",   KEYWORD_DECLARATION, false),
+  KEYWORD("FAR ",      KEYWORD_DECLARATION, false),
+  KEYWORD("float ",    KEYWORD_DECLARATION, false),
+  KEYWORD("int ",      KEYWORD_DECLARATION, false),
+  KEYWORD("int16_t ",  KEYWORD_DECLARATION, false),
+  KEYWORD("int32_t ",  KEYWORD_DECLARATION, false),
+  KEYWORD("long ",     KEYWORD_DECLARATION, false),
+  KEYWORD("off_t ",    KEYWORD_DECLARATION, false),
+  KEYWORD("register ", KEYWORD_DECLARATION, false),
+  KEYWORD("short ",    KEYWORD_DECLARATION, false),
+  KEYWORD("signed ",   KEYWORD_DECLARATION, false),
+  KEYWORD("size_t ",   KEYWORD_DECLARATION, false),
+  KEYWORD("ssize_t ",  KEYWORD_DECLARATION, false),
+  KEYWORD("static ",   KEYWORD_DECLARATION, false),
+  KEYWORD("time_t ",   KEYWORD_DECLARATION, false),
+  KEYWORD("typedef ",  KEYWORD_DECLARATION, false),
+  KEYWORD("uint8_t ",  KEYWORD_DECLARATION, false),
+  KEYWORD("uint16_t ", KEYWORD_DECLARATION, false),
+  KEYWORD("uint32_t ", KEYWORD_DECLARATION, false),
+  KEYWORD("union ",    KEYWORD_DECLARATION, false),
+  KEYWORD("union\n",   KEYWORD_DECLARATION, false), /* May be unnamed */
+  KEYWORD("unsigned ", KEYWORD_DECLARATION, false),
+  KEYWORD("void ",     KEYWORD_DECLARATION, false),
+  KEYWORD("volatile ", KEYWORD_DECLARATION, false),
+
+  KEYWORD("break ",    KEYWORD_STATEMENT,   false),
+  KEYWORD("continue ", KEYWORD_STATEMENT,   false),
+  KEYWORD("do ",       KEYWORD_STATEMENT,   false),
+  KEYWORD("else ",     KEYWORD_STATEMENT,   false),
+  KEYWORD("goto ",     KEYWORD_STATEMENT,   false),
+  KEYWORD("return ",   KEYWORD_STATEMENT,   false),
+  KEYWORD("while ",    KEYWORD_STATEMENT,   false),
+  KEYWORD("if ",       KEYWORD_IF,          false),
+
+  /* Spacing works a little differently for and switch statements */
+
+  KEYWORD("for ",      KEYWORD_FOR,         false),
+  KEYWORD("switch ",   KEYWORD_SWITCH,      false),
+  KEYWORD("switch(",   KEYWORD_SWITCH,      true),
+  KEYWORD("case ",     KEYWORD_CASE,        false),
+  KEYWORD("case(",     KEYWORD_CASE,        true),
+  KEYWORD("default ",  KEYWORD_CASE,        true),
+  KEYWORD("default:",  KEYWORD_CASE,        false),
+
+  /* Also check for C keywords with missing white space */
+
+  KEYWORD("do(",       KEYWORD_STATEMENT,   true),
+  KEYWORD("while(",    KEYWORD_STATEMENT,   true),
+  KEYWORD("if(",       KEYWORD_IF,          true),
+  KEYWORD("for(",      KEYWORD_FOR,         true),
+  {
+    NULL, 0, 0, false
+  }
+};
+
 static const char *g_white_prefix[] =
 {
   "ASCII_",  /* Ref:  include/nuttx/ascii.h */
@@ -711,6 +814,14 @@ static const char *g_white_files[] =
   NULL
 };
 
+/* Lengths of the white-listed strings above.  These are invariant, so they
+ * are computed once by init_white_lists() rather than on every identifier.
+ */
+
+static size_t g_white_prefix_len[NELEMS(g_white_prefix)];
+static size_t g_white_suffix_len[NELEMS(g_white_suffix)];
+static size_t g_white_content_len[NELEMS(g_white_content_list)];
+
 /********************************************************************************
  * Private Functions
  ********************************************************************************/
@@ -724,18 +835,18 @@ static const char *g_white_files[] =
 
 static void show_usage(char *progname, int exitcode, char *what)
 {
-  fprintf(stderr, "%s version %s\n\n", basename(progname), NXSTYLE_VERSION);
+  const char *name = basename(progname);
+
+  fprintf(stderr, "%s version %s\n\n", name, NXSTYLE_VERSION);
   if (what)
     {
       fprintf(stderr, "%s\n", what);
     }
 
   fprintf(stderr, "Usage:  %s [-m <excess>] [-v <level>] "
-                  "[-r <start,count>] <filename>\n",
-          basename(progname));
-  fprintf(stderr, "        %s -h this help\n", basename(progname));
-  fprintf(stderr, "        %s -v <level> where level is\n",
-          basename(progname));
+                  "[-r <start,count>] <filename>...\n", name);
+  fprintf(stderr, "        %s -h this help\n", name);
+  fprintf(stderr, "        %s -v <level> where level is\n", name);
   fprintf(stderr, "                   0 - no output\n");
   fprintf(stderr, "                   1 - PASS/FAIL\n");
   fprintf(stderr, "                   2 - output each line (default)\n");
@@ -980,6 +1091,15 @@ static int block_comment_width(char *line)
     {
     }
 
+  /* Only a line beginning with '/' or '*' can be the first or last line of
+   * a block comment.  Don't bother measuring any other line.
+   */
+
+  if (line[b] != '/' && line[b] != '*')
+    {
+      return 0;
+    }
+
   /* Skip over any trailing whitespace at the end of the line */
 
   for (e = strlen(line) - 1; e >= 0 && isspace(line[e]); e--)
@@ -1102,6 +1222,15 @@ static bool check_section_header(const char *line, int lineno)
 {
   int i;
 
+  /* Every section header line begins with " *", so most lines can be
+   * rejected without searching the whole table.
+   */
+
+  if (line[0] != ' ' || line[1] != '*')
+    {
+      return false;
+    }
+
   /* Search g_section_info[] to find a matching section header line */
 
   for (i = FIRST_SECTION; i <= LAST_SECTION; i++)
@@ -1124,6 +1253,34 @@ static bool check_section_header(const char *line, int lineno)
   return false;
 }
 
+/********************************************************************************
+ * Name: find_keyword
+ *
+ * Description:
+ *   Return the g_keywords[] entry that matches the beginning of the string,
+ *   or NULL if the string does not begin with a known keyword.
+ *
+ ********************************************************************************/
+
+static const struct keyword_s *find_keyword(const char *str)
+{
+  const struct keyword_s *kw;
+
+  /* Compare the first character before calling strncmp(), most lines do
+   * not start with a keyword at all.
+   */
+
+  for (kw = g_keywords; kw->name != NULL; kw++)
+    {
+      if (kw->name[0] == str[0] && strncmp(str, kw->name, kw->len) == 0)
+        {
+          return kw;
+        }
+    }
+
+  return NULL;
+}
+
 /********************************************************************************
  * Name: white_file_list
  *
@@ -1150,6 +1307,35 @@ static bool white_file_list(const char *filename)
   return false;
 }
 
+/********************************************************************************
+ * Name:  init_white_lists
+ *
+ * Description:
+ *   Pre-compute the lengths of the white-listed prefixes, suffixes and
+ *   identifiers so that white_content_list() does not have to.
+ *
+ ********************************************************************************/
+
+static void init_white_lists(void)
+{
+  int i;
+
+  for (i = 0; g_white_prefix[i] != NULL; i++)
+    {
+      g_white_prefix_len[i] = strlen(g_white_prefix[i]);
+    }
+
+  for (i = 0; g_white_suffix[i] != NULL; i++)
+    {
+      g_white_suffix_len[i] = strlen(g_white_suffix[i]);
+    }
+
+  for (i = 0; g_white_content_list[i] != NULL; i++)
+    {
+      g_white_content_len[i] = strlen(g_white_content_list[i]);
+    }
+}
+
 /********************************************************************************
  * Name:  white_content_list
  *
@@ -1164,13 +1350,11 @@ static bool white_content_list(const char *ident, int lineno)
   const char *str;
   size_t len2;
   size_t len;
+  int i;
 
-  for (pptr = g_white_prefix;
-       (str = *pptr) != NULL;
-       pptr++)
+  for (i = 0; (str = g_white_prefix[i]) != NULL; i++)
     {
-      len = strlen(str);
-      if (strncmp(ident, str, len) == 0)
+      if (strncmp(ident, str, g_white_prefix_len[i]) == 0)
         {
           return true;
         }
@@ -1192,22 +1376,18 @@ static bool white_content_list(const char *ident, int lineno)
       len2--;
     }
 
-  for (pptr = g_white_suffix;
-       (str = *pptr) != NULL;
-       pptr++)
+  for (i = 0; (str = g_white_suffix[i]) != NULL; i++)
     {
-      len = strlen(str);
+      len = g_white_suffix_len[i];
       if (len2 >= len && strncmp(ident + len2 - len, str, len) == 0)
         {
           return true;
         }
     }
 
-  for (pptr = g_white_content_list;
-       (str = *pptr) != NULL;
-       pptr++)
+  for (i = 0; (str = g_white_content_list[i]) != NULL; i++)
     {
-      len = strlen(str);
+      len = g_white_content_len[i];
       if (strncmp(ident, str, len) == 0 &&
           isalnum(ident[len]) == 0)
         {
@@ -1219,10 +1399,15 @@ static bool white_content_list(const char *ident, int lineno)
 }
 
 /********************************************************************************
- * Public Functions
+ * Name: check_file
+ *
+ * Description:
+ *   Check one file for compliance with the coding standard.  Returns zero
+ *   if no errors were found.
+ *
  ********************************************************************************/
 
-int main(int argc, char **argv, char **envp)
+static int check_file(const char *filename, int excess)
 {
   FILE *instream;       /* File input stream */
   char line[LINE_SIZE]; /* The current line being examined */
@@ -1265,77 +1450,22 @@ int main(int argc, char **argv, char **envp)
   int rbrace_lineno;    /* Last line containing a right brace */
   int externc_lineno;   /* Last line where 'extern "C"' declared */
   int linelen;          /* Length of the line */
-  int excess;
   int n;
   int i;
-  int c;
+  const struct keyword_s *keyword;
 
-  excess = 0;
-  while ((c = getopt(argc, argv, ":hv:gm:r:")) != -1)
-    {
-      switch (c)
-      {
-      case 'm':
-        excess = atoi(optarg);
-        if (excess < 1)
-          {
-            show_usage(argv[0], 1, "Bad value for <excess>.");
-            excess = 0;
-          }
-
-        break;
-
-      case 'v':
-        g_verbose = atoi(optarg);
-        if (g_verbose < 0 || g_verbose > 2)
-          {
-            show_usage(argv[0], 1, "Bad value for <level>.");
-          }
-
-        break;
-
-      case 'r':
-        g_rangestart[g_rangenumber] = atoi(strtok(optarg, ","));
-        g_rangecount[g_rangenumber++] = atoi(strtok(NULL, ","));
-        break;
-
-      case 'h':
-        show_usage(argv[0], 0, NULL);
-        break;
+  /* Reset the per-file state left over from any previous file */
 
-      case ':':
-        show_usage(argv[0], 1, "Missing argument.");
-        break;
-
-      case '?':
-        show_usage(argv[0], 1, "Unrecognized option.");
-        break;
+  g_file_type     = UNKNOWN;
+  g_section       = NO_SECTION;
+  g_status        = 0;
+  g_skipmixedcase = false;
 
-      default:
-        show_usage(argv[0], 0, NULL);
-        break;
-      }
-  }
-
-  if (optind < argc - 1 || argv[optind] == NULL)
-    {
-      show_usage(argv[0], 1, "No file name given.");
-    }
-
-  /* Resolve the absolute path for the input file */
-
-  if (realpath(argv[optind], g_file_name) == NULL)
-    {
-      FATALFL("Failed to resolve absolute path.", g_file_name);
-      return 1;
-    }
-
-#ifdef CONFIG_WINDOWS_NATIVE
-  backslash_to_slash(g_file_name);
-#endif
-  /* Are we parsing a header file? */
+  /* Are we parsing a header file?  Only C sources and headers are checked,
+   * so decide that from the name given before resolving the path.
+   */
 
-  ext = strrchr(g_file_name, '.');
+  ext = strrchr(filename, '.');
 
   if (ext == 0)
     {
@@ -1354,6 +1484,18 @@ int main(int argc, char **argv, char **envp)
       return 0;
     }
 
+  /* Resolve the absolute path for the input file */
+
+  if (realpath(filename, g_file_name) == NULL)
+    {
+      FATALFL("Failed to resolve absolute path.", g_file_name);
+      return 1;
+    }
+
+#ifdef CONFIG_WINDOWS_NATIVE
+  backslash_to_slash(g_file_name);
+#endif
+
   if (white_file_list(g_file_name))
     {
       return 0;
@@ -1367,6 +1509,12 @@ int main(int argc, char **argv, char **envp)
       return 1;
     }
 
+  /* The file is read twice, line by line.  Give the stream a large buffer
+   * so that each pass reads it from the system in a few large chunks.
+   */
+
+  setvbuf(instream, g_iobuffer, _IOFBF, sizeof(g_iobuffer));
+
   /* Determine the line width */
 
   g_maxline = get_line_width(instream) + excess;
@@ -1934,8 +2082,12 @@ int main(int argc, char **argv, char **envp)
 
       if (linelen >= 5)
         {
-          lptr = strstr(line, "*/");
+          /* Only search for the comment terminator if the line actually
+           * begins with a comment.
+           */
+
           if (line[indent] == '/' && line[indent + 1] == '*' &&
+              (lptr = strstr(line, "*/")) != NULL &&
               lptr - line == linelen - 3)
             {
               /* If preceding comments were to the right of code, then we can
@@ -1982,49 +2134,19 @@ int main(int argc, char **argv, char **envp)
             }
         }
 
-      /* Check for some kind of declaration.
-       * REVISIT: The following logic fails for any non-standard types.
-       * REVISIT: Terminator after keyword might not be a space.  Might be
-       * a newline, for example.  struct and unions are often unnamed, for
-       * example.
+      /* Check for a keyword indicating the beginning of a declaration or a
+       * statement.
        */
 
-      else if (inasm == 0)
+      else if (inasm == 0 &&
+               (keyword = find_keyword(&line[indent])) != NULL)
         {
-          if (strncmp(&line[indent], "auto ", 5) == 0 ||
-                   strncmp(&line[indent], "bool ", 5) == 0 ||
-                   strncmp(&line[indent], "char ", 5) == 0 ||
-                   strncmp(&line[indent], "CODE ", 5) == 0 ||
-                   strncmp(&line[indent], "const ", 6) == 0 ||
-                   strncmp(&line[indent], "double ", 7) == 0 ||
-                   strncmp(&line[indent], "struct ", 7) == 0 ||
-                   strncmp(&line[indent], "struct\n", 7) == 0 || /* May be unnamed */
-                   strncmp(&line[indent], "enum ", 5) == 0 ||
-                   strncmp(&line[indent], "extern ", 7) == 0 ||
-                   strncmp(&line[indent], "EXTERN ", 7) == 0 ||
-                   strncmp(&line[indent], "FAR ", 4) == 0 ||
-                   strncmp(&line[indent], "float ", 6) == 0 ||
-                   strncmp(&line[indent], "int ", 4) == 0 ||
-                   strncmp(&line[indent], "int16_t ", 8) == 0 ||
-                   strncmp(&line[indent], "int32_t ", 8) == 0 ||
-                   strncmp(&line[indent], "long ", 5) == 0 ||
-                   strncmp(&line[indent], "off_t ", 6) == 0 ||
-                   strncmp(&line[indent], "register ", 9) == 0 ||
-                   strncmp(&line[indent], "short ", 6) == 0 ||
-                   strncmp(&line[indent], "signed ", 7) == 0 ||
-                   strncmp(&line[indent], "size_t ", 7) == 0 ||
-                   strncmp(&line[indent], "ssize_t ", 8) == 0 ||
-                   strncmp(&line[indent], "static ", 7) == 0 ||
-                   strncmp(&line[indent], "time_t ", 7) == 0 ||
-                   strncmp(&line[indent], "typedef ", 8) == 0 ||
-                   strncmp(&line[indent], "uint8_t ", 8) == 0 ||
-                   strncmp(&line[indent], "uint16_t ", 9) == 0 ||
-                   strncmp(&line[indent], "uint32_t ", 9) == 0 ||
-                   strncmp(&line[indent], "union ", 6) == 0 ||
-                   strncmp(&line[indent], "union\n", 6) == 0 ||  /* May be unnamed */
-                   strncmp(&line[indent], "unsigned ", 9) == 0 ||
-                   strncmp(&line[indent], "void ", 5) == 0 ||
-                   strncmp(&line[indent], "volatile ", 9) == 0)
+          if (keyword->error)
+            {
+              ERROR("Missing whitespace after keyword", lineno, n);
+            }
+
+          if (keyword->type == KEYWORD_DECLARATION)
             {
               /* Check if this is extern "C";  We don't typically indent
                * following this.
@@ -2106,83 +2228,28 @@ int main(int argc, char **argv, char **envp)
                 }
             }
 
-          /* Check for a keyword indicating the beginning of a statement.
-           * REVISIT:  This, obviously, will not detect statements that do not
-           * begin with a C keyword (such as assignment statements).
-           */
-
-          else if (strncmp(&line[indent], "break ", 6) == 0 ||
-                   strncmp(&line[indent], "continue ", 9) == 0 ||
-                   strncmp(&line[indent], "do ", 3) == 0 ||
-                   strncmp(&line[indent], "else ", 5) == 0 ||
-                   strncmp(&line[indent], "goto ", 5) == 0 ||
-                   strncmp(&line[indent], "return ", 7) == 0 ||
-                   strncmp(&line[indent], "while ", 6) == 0)
+          else if (keyword->type == KEYWORD_STATEMENT)
             {
               bstatm = true;
             }
-
-          else if(strncmp(&line[indent], "if ", 3) == 0)
+          else if (keyword->type == KEYWORD_IF)
             {
               bif    = true;
               bstatm = true;
             }
-
-          /* Spacing works a little differently for and switch statements */
-
-          else if (strncmp(&line[indent], "for ", 4) == 0)
+          else if (keyword->type == KEYWORD_FOR)
             {
               bfor   = true;
               bstatm = true;
             }
-          else if (strncmp(&line[indent], "switch ", 7) == 0)
-            {
-              bswitch = true;
-            }
-          else if (strncmp(&line[indent], "switch(", 7) == 0)
+          else if (keyword->type == KEYWORD_SWITCH)
             {
-              ERROR("Missing whitespace after keyword", lineno, n);
               bswitch = true;
             }
-          else if (strncmp(&line[indent], "case ", 5) == 0)
-            {
-              bcase = true;
-            }
-          else if (strncmp(&line[indent], "case(", 5) == 0)
-            {
-              ERROR("Missing whitespace after keyword", lineno, n);
-              bcase = true;
-            }
-          else if (strncmp(&line[indent], "default ", 8) == 0)
+          else if (keyword->type == KEYWORD_CASE)
             {
-              ERROR("Missing whitespace after keyword", lineno, n);
               bcase = true;
             }
-          else if (strncmp(&line[indent], "default:", 8) == 0)
-            {
-              bcase = true;
-            }
-
-          /* Also check for C keywords with missing white space */
-
-          else if (strncmp(&line[indent], "do(", 3) == 0 ||
-                   strncmp(&line[indent], "while(", 6) == 0)
-            {
-              ERROR("Missing whitespace after keyword", lineno, n);
-              bstatm = true;
-            }
-          else if (strncmp(&line[indent], "if(", 3) == 0)
-            {
-              ERROR("Missing whitespace after keyword", lineno, n);
-              bif   = true;
-              bstatm = true;
-            }
-          else if (strncmp(&line[indent], "for(", 4) == 0)
-            {
-              ERROR("Missing whitespace after keyword", lineno, n);
-              bfor   = true;
-              bstatm = true;
-            }
         }
 
       /* STEP 3: Parse each character on the line */
@@ -3110,61 +3177,17 @@ int main(int argc, char **argv, char **envp)
 
                   break;
 
-                case '%':
-
-                  /* %= */
-
-                  if (line[n + 1] == '=')
-                    {
-                      check_spaces_leftright(line, lineno, n, n + 1);
-                      n++;
-                    }
-                  else
-                    {
-                      check_spaces_leftright(line, lineno, n, n);
-                    }
-
-                  break;
-
                 case '<':
-
-                  /* <=, <<, <<= */
-
-                  if (line[n + 1] == '=')
-                    {
-                      check_spaces_leftright(line, lineno, n, n + 1);
-                      n++;
-                    }
-                  else if (line[n + 1] == '<')
-                    {
-                      if (line[n + 2] == '=')
-                        {
-                          check_spaces_leftright(line, lineno, n, n + 2);
-                          n += 2;
-                        }
-                      else
-                        {
-                          check_spaces_leftright(line, lineno, n, n + 1);
-                          n++;
-                        }
-                    }
-                  else
-                    {
-                      check_spaces_leftright(line, lineno, n, n);
-                    }
-
-                  break;
-
                 case '>':
 
-                  /* >=, >>, >>= */
+                  /* <=, <<, <<=, >=, >>, >>= */
 
                   if (line[n + 1] == '=')
                     {
                       check_spaces_leftright(line, lineno, n, n + 1);
                       n++;
                     }
-                  else if (line[n + 1] == '>')
+                  else if (line[n + 1] == line[n])
                     {
                       if (line[n + 2] == '=')
                         {
@@ -3204,25 +3227,12 @@ int main(int argc, char **argv, char **envp)
                     }
 
                   break;
-                case '^':
-
-                  /* ^= */
-
-                  if (line[n + 1] == '=')
-                    {
-                      check_spaces_leftright(line, lineno, n, n + 1);
-                      n++;
-                    }
-                  else
-                    {
-                      check_spaces_leftright(line, lineno, n, n);
-                    }
-
-                  break;
 
+                case '%':
+                case '^':
                 case '=':
 
-                  /* == */
+                  /* %=, ^=, == */
 
                   if (line[n + 1] == '=')
                     {
@@ -3593,3 +3603,77 @@ int main(int argc, char **argv, char **envp)
 
   return g_status;
 }
+
+/********************************************************************************
+ * Public Functions
+ ********************************************************************************/
+
+int main(int argc, char **argv, char **envp)
+{
+  int status;
+  int excess;
+  int c;
+
+  excess = 0;
+  while ((c = getopt(argc, argv, ":hv:gm:r:")) != -1)
+    {
+      switch (c)
+      {
+      case 'm':
+        excess = atoi(optarg);
+        if (excess < 1)
+          {
+            show_usage(argv[0], 1, "Bad value for <excess>.");
+            excess = 0;
+          }
+
+        break;
+
+      case 'v':
+        g_verbose = atoi(optarg);
+        if (g_verbose < 0 || g_verbose > 2)
+          {
+            show_usage(argv[0], 1, "Bad value for <level>.");
+          }
+
+        break;
+
+      case 'r':
+        g_rangestart[g_rangenumber] = atoi(strtok(optarg, ","));
+        g_rangecount[g_rangenumber++] = atoi(strtok(NULL, ","));
+        break;
+
+      case 'h':
+        show_usage(argv[0], 0, NULL);
+        break;
+
+      case ':':
+        show_usage(argv[0], 1, "Missing argument.");
+        break;
+
+      case '?':
+        show_usage(argv[0], 1, "Unrecognized option.");
+        break;
+
+      default:
+        show_usage(argv[0], 0, NULL);
+        break;
+      }
+  }
+
+  if (argv[optind] == NULL)
+    {
+      show_usage(argv[0], 1, "No file name given.");
+    }
+
+  init_white_lists();
+
+  /* Check each file named on the command line */
+
+  for (status = 0; optind < argc; optind++)
+    {
+      status |= check_file(argv[optind], excess);
+    }
+
+  return status;
+}